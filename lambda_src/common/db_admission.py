@@ -0,0 +1,171 @@
+"""Shared database connection and admission control for the DB-backed Lambdas.
+
+Packaged at the root of the get_customer, create_order and new_user zips
+next to each index.py by scripts/package_lambdas.py.
+
+Credentials come from the Secrets Manager secret in DB_SECRET_ARN (set by
+Terraform). DB_HOST, DB_PORT, DB_USER, DB_PASSWORD and DB_NAME override
+individual fields, which is how local tools point the handlers elsewhere.
+
+When MySQL refuses a connection because max_connections is reached,
+DB_ADMISSION_MODE decides what happens: 'queue' (default) retries with
+jittered backoff for up to DB_ADMISSION_WAIT_MS before shedding, 'shed'
+sheds immediately and 'off' fails the request as before. Shed requests get
+a REPROMPT action-group response instead of an internal server error.
+"""
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import pymysql
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_MODES = ('off', 'queue', 'shed')
+
+# Too many connections, too many user connections, max_user_connections exceeded
+CONNECTION_LIMIT_ERRORS = (1040, 1203, 1226)
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None or raw == '':
+        return default
+    try:
+        value = int(raw)
+        if value < 0:
+            raise ValueError(raw)
+        return value
+    except ValueError:
+        logger.warning('Invalid %s=%r, using default %d', name, raw, default)
+        return default
+
+
+def _env_mode(name: str, default: str) -> str:
+    raw = os.environ.get(name)
+    if raw is None or raw == '':
+        return default
+    mode = raw.strip().lower()
+    if mode not in ADMISSION_MODES:
+        logger.warning('Invalid %s=%r, expected one of %s; using %r',
+                       name, raw, ', '.join(ADMISSION_MODES), default)
+        return default
+    return mode
+
+
+DB_ADMISSION_MODE = _env_mode('DB_ADMISSION_MODE', 'queue')
+DB_ADMISSION_WAIT_MS = _env_int('DB_ADMISSION_WAIT_MS', 2000)
+
+_db_config: Optional[Dict[str, Any]] = None
+
+
+def _load_secret(secret_arn: str) -> Dict[str, Any]:
+    import boto3
+
+    response = boto3.client('secretsmanager').get_secret_value(SecretId=secret_arn)
+    secret = json.loads(response['SecretString'])
+    return {
+        'host': secret.get('host'),
+        'port': int(secret.get('port') or 3306),
+        'user': secret.get('username'),
+        'password': secret.get('password'),
+        'database': secret.get('dbname')
+    }
+
+
+def db_config() -> Dict[str, Any]:
+    """Connection settings, fetched once per container and cached."""
+    global _db_config
+    if _db_config is None:
+        secret_arn = os.environ.get('DB_SECRET_ARN')
+        config = _load_secret(secret_arn) if secret_arn else {}
+        overrides = {
+            'host': os.environ.get('DB_HOST'),
+            'port': _env_int('DB_PORT', config.get('port') or 3306),
+            'user': os.environ.get('DB_USER'),
+            'password': os.environ.get('DB_PASSWORD'),
+            'database': os.environ.get('DB_NAME')
+        }
+        config.update({key: value for key, value in overrides.items() if value is not None})
+        config.setdefault('database', 'Shoeshop')
+        missing = [key for key in ('host', 'user', 'password') if config.get(key) is None]
+        if missing:
+            raise RuntimeError(f"Database settings missing: {', '.join(missing)}; "
+                               "set DB_SECRET_ARN or the DB_* environment variables")
+        _db_config = config
+    return _db_config
+
+
+class AdmissionStats:
+    """Counts refused connections in this process, as they happen."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.refused = 0
+        self.retried = 0
+        self.shed = 0
+        self.first_refused_at: Optional[float] = None
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self.refused += 1
+            if self.first_refused_at is None:
+                self.first_refused_at = time.monotonic()
+            if outcome == 'retried':
+                self.retried += 1
+            elif outcome == 'shed':
+                self.shed += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {'refused': self.refused, 'retried': self.retried, 'shed': self.shed}
+
+
+stats = AdmissionStats()
+
+
+class DatabaseBusy(Exception):
+    """Raised when no database connection could be admitted."""
+
+
+def connect_with_admission(**kwargs: Any) -> pymysql.connections.Connection:
+    deadline = time.monotonic() + DB_ADMISSION_WAIT_MS / 1000
+    delay = 0.05
+    while True:
+        try:
+            return pymysql.connect(**db_config(), **kwargs)
+        except pymysql.MySQLError as e:
+            if not e.args or e.args[0] not in CONNECTION_LIMIT_ERRORS:
+                raise
+            remaining = deadline - time.monotonic()
+            if DB_ADMISSION_MODE == 'off':
+                stats.record('failed')
+                raise
+            if DB_ADMISSION_MODE == 'shed' or remaining <= 0:
+                stats.record('shed')
+                raise DatabaseBusy(str(e)) from e
+            stats.record('retried')
+            time.sleep(min(remaining, random.uniform(0, delay)))
+            delay = min(delay * 2, 1.0)
+
+
+def busy_response(action_group: str, function: str, message_version: Any) -> Dict[str, Any]:
+    return {
+        'response': {
+            'actionGroup': action_group,
+            'function': function,
+            'functionResponse': {
+                'responseState': 'REPROMPT',
+                'responseBody': {
+                    'TEXT': {
+                        'body': "We're getting a lot of requests right now. Please try again in a moment."
+                    }
+                }
+            }
+        },
+        'messageVersion': message_version
+    }
@@ -1,7 +1,9 @@
-# import logging
+import logging
 from typing import Dict, Any
 from http import HTTPStatus
 import pymysql
+
+from db_admission import DatabaseBusy, busy_response, connect_with_admission
 import boto3
 
 logger = logging.getLogger()
@@ -39,12 +41,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.info(f"Received parameters: customer_input={customer_input}, shoe_id={shoe_id}, operation={operation}")
 
         # Connect to DB
-        connection = pymysql.connect(
-            host='retail-chatbot-db.c0d6e6o2ahcp.us-east-1.rds.amazonaws.com',
-            user='admin',
-            password='Pavan1845',
-            database='Shoeshop'
-        )
+        connection = connect_with_admission()
 
         try:
             with connection.cursor() as cursor:
@@ -172,6 +169,10 @@ Retail Shoe Store
             'messageVersion': message_version
         }
 
+    except DatabaseBusy as e:
+        logger.warning('Database connection not admitted: %s', str(e))
+        return busy_response(action_group, function, message_version)
+
     except KeyError as e:
         logger.error('Missing required field: %s', str(e))
         return {
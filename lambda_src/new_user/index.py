@@ -1,9 +1,11 @@
-# import logging
+import logging
 import re
 from typing import Dict, Any
 from http import HTTPStatus
 import pymysql
 
+from db_admission import DatabaseBusy, busy_response, connect_with_admission
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
@@ -88,13 +90,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             }
 
         # Connect to RDS
-        connection = pymysql.connect(
-            host='retail-chatbot-db.c0d6e6o2ahcp.us-east-1.rds.amazonaws.com',
-            user='admin',
-            password='Pavan1845',
-            database='Shoeshop',
-            cursorclass=pymysql.cursors.DictCursor
-        )
+        connection = connect_with_admission(cursorclass=pymysql.cursors.DictCursor)
 
         try:
             with connection.cursor() as cursor:
@@ -143,6 +139,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'messageVersion': message_version
         }
 
+    except DatabaseBusy as e:
+        logger.warning('Database connection not admitted: %s', str(e))
+        return busy_response(action_group, function, message_version)
+
     except Exception as e:
         logger.error("Error in new_user_registration: %s", str(e))
         return {
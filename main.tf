@@ -337,17 +337,29 @@ locals {
   }
 }
 
+# Zips are built by scripts/package_lambdas.py, which bundles
+# lambda_src/common/db_admission.py and pymysql into the DB-backed functions
+resource "aws_s3_object" "lambda_zip" {
+  for_each = local.lambda_map
+
+  bucket = aws_s3_bucket.artifacts.id
+  key    = each.value.s3_key
+  source = "${path.module}/build/${each.value.s3_key}"
+  etag   = filemd5("${path.module}/build/${each.value.s3_key}")
+}
+
 resource "aws_lambda_function" "functions" {
   for_each = local.lambda_map
 
-  function_name = "${var.project_name}-${each.key}"
-  s3_bucket     = aws_s3_bucket.artifacts.id
-  s3_key        = each.value.s3_key
-  handler       = "index.lambda_handler"
-  runtime       = var.lambda_runtime
-  role          = aws_iam_role.lambda_role.arn
-  memory_size   = each.value.memory
-  timeout       = each.value.timeout
+  function_name    = "${var.project_name}-${each.key}"
+  s3_bucket        = aws_s3_bucket.artifacts.id
+  s3_key           = aws_s3_object.lambda_zip[each.key].key
+  source_code_hash = filebase64sha256("${path.module}/build/${each.value.s3_key}")
+  handler          = "index.lambda_handler"
+  runtime          = var.lambda_runtime
+  role             = aws_iam_role.lambda_role.arn
+  memory_size      = each.value.memory
+  timeout          = each.value.timeout
 
   vpc_config {
     subnet_ids = values(aws_subnet.private)[*].id
@@ -0,0 +1,88 @@
+"""Build the Lambda deployment zips that main.tf uploads to S3.
+
+Each zip gets the function's own files from `lambda_src/<name>/`. The
+DB-backed functions also get the shared `lambda_src/common/db_admission.py`
+and their pip dependencies at the zip root, so `import db_admission` and
+`import pymysql` resolve in the Lambda runtime.
+
+Usage:
+    python scripts/package_lambdas.py          # writes build/<name>.zip
+    terraform apply                            # uploads and deploys them
+"""
+import argparse
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+from typing import Optional, Sequence
+
+logger = logging.getLogger("package_lambdas")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAMBDA_SRC = os.path.join(ROOT, "lambda_src")
+BUILD_DIR = os.path.join(ROOT, "build")
+
+# Function -> extra files from lambda_src/common and pip requirements.
+# boto3 is provided by the Lambda Python runtime.
+FUNCTIONS = {
+    "bedrock_agent": {"common": [], "requirements": []},
+    "get_customer": {"common": ["db_admission.py"], "requirements": ["pymysql"]},
+    "create_order": {"common": ["db_admission.py"], "requirements": ["pymysql"]},
+    "new_user": {"common": ["db_admission.py"], "requirements": ["pymysql"]},
+}
+
+
+def build(name: str, output_dir: str) -> str:
+    spec = FUNCTIONS[name]
+    with tempfile.TemporaryDirectory() as staging:
+        shutil.copytree(os.path.join(LAMBDA_SRC, name), staging, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+        for filename in spec["common"]:
+            shutil.copy2(os.path.join(LAMBDA_SRC, "common", filename), staging)
+        if spec["requirements"]:
+            subprocess.run(
+                [sys.executable, "-m", "pip", "install", "--quiet", "--target", staging,
+                 *spec["requirements"]],
+                check=True,
+            )
+
+        path = os.path.join(output_dir, f"{name}.zip")
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for directory, dirnames, filenames in os.walk(staging):
+                dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+                for filename in sorted(filenames):
+                    if filename.endswith(".pyc"):
+                        continue
+                    full = os.path.join(directory, filename)
+                    archive.write(full, os.path.relpath(full, staging))
+
+        # Fail the build rather than the deployed function if the handler
+        # cannot find its shared modules
+        with zipfile.ZipFile(path) as archive:
+            names = set(archive.namelist())
+        for required in ["index.py", *spec["common"]]:
+            if required not in names:
+                raise RuntimeError(f"{path} is missing {required}")
+    return path
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build the Lambda deployment zips.")
+    parser.add_argument("functions", nargs="*", help="functions to build (default: all)")
+    parser.add_argument("--output-dir", default=BUILD_DIR)
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.functions if name not in FUNCTIONS]
+    if unknown:
+        parser.error(f"unknown functions: {', '.join(unknown)} (choose from {', '.join(FUNCTIONS)})")
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    os.makedirs(args.output_dir, exist_ok=True)
+    for name in args.functions or FUNCTIONS:
+        logger.info("Built %s", build(name, args.output_dir))
+
+
+if __name__ == "__main__":
+    main()
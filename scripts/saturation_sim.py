@@ -0,0 +1,416 @@
+"""Concurrency saturation simulator for Lambda-to-RDS connection limits.
+
+Drives N concurrent virtual Lambda containers through the real handlers in
+`lambda_src/` against a local MySQL database with a capped
+`max_connections`, and reports when and how saturation happens: the
+concurrency and time of the first refused connection, and per-second
+refusals, retries, outcomes (ok / shed / error), latency and server-side
+connection counts.
+
+Usage:
+    # Seed the database first (see scripts/seed_data.py), then:
+    python scripts/saturation_sim.py --containers 200 --max-connections 50 \
+        --ramp-seconds 30 --duration 60 --admission off
+    python scripts/saturation_sim.py --containers 200 --max-connections 50 \
+        --ramp-seconds 30 --duration 60 --admission queue
+
+The handlers connect with DB_HOST, DB_PORT, DB_USER, DB_PASSWORD and
+DB_NAME, exactly as in Lambda. DB_USER must be set and should be a
+non-admin account, since MySQL lets admin accounts use one connection past
+the cap. Changing the cap and sampling the server use a separate admin
+account from DB_ADMIN_USER and DB_ADMIN_PASSWORD, which needs
+SYSTEM_VARIABLES_ADMIN (or SUPER). The monitor keeps one connection open,
+so the server cap is set to --max-connections + 1 and the monitor is left
+out of the reported connection count. The original cap is restored on
+exit.
+
+create_order imports boto3, and its SES client is replaced with a no-op
+sender so no emails go out.
+"""
+import argparse
+import bisect
+import importlib
+import importlib.util
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from seed_data import ACTIVITY_TYPES, COLORS, random_name  # noqa: E402
+
+logger = logging.getLogger("saturation_sim")
+
+LAMBDA_SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lambda_src")
+HANDLERS = ("get_customer", "create_order", "new_user")
+
+# Connections the simulator itself holds while containers run
+MONITOR_CONNECTIONS = 1
+
+
+class NullSesClient:
+    """Stands in for the SES client so create_order does not send real emails."""
+
+    def send_email(self, **kwargs: Any) -> Dict[str, Any]:
+        return {"MessageId": "simulated"}
+
+
+def admin_config() -> Dict[str, Any]:
+    return {
+        "host": os.environ["DB_HOST"],
+        "port": int(os.environ["DB_PORT"]),
+        "user": os.environ.get("DB_ADMIN_USER", "root"),
+        "password": os.environ.get("DB_ADMIN_PASSWORD", ""),
+    }
+
+
+def load_handler(name: str) -> ModuleType:
+    """Import lambda_src/<name>/index.py the way the Lambda runtime would."""
+    spec = importlib.util.spec_from_file_location(f"{name}_index", os.path.join(LAMBDA_SRC, name, "index.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if hasattr(module, "ses_client"):
+        module.ses_client = NullSesClient()
+    return module
+
+
+def make_event(name: str, rng: random.Random, n_customers: int, n_shoes: int) -> Dict[str, Any]:
+    """Build a Bedrock action-group event like the agent sends for each handler."""
+    if name == "get_customer":
+        params = {
+            "name": random_name(rng),
+            "activity_type": rng.choice(ACTIVITY_TYPES)[0],
+            "shoe_color": rng.choice(COLORS)[0],
+        }
+        if rng.random() < 0.5:
+            params["price_limit"] = f"below {rng.choice([2000, 4000, 6000])}"
+    elif name == "create_order":
+        params = {"customer_id": str(rng.randint(1, n_customers))}
+        if rng.random() < 0.3:
+            params.update(operation="create", shoe_id=str(rng.randint(1, n_shoes)))
+        else:
+            params["operation"] = "fetch"
+    else:
+        params = {
+            "name": random_name(rng),
+            "email": f"sim{rng.randrange(10 ** 9)}@example.com",
+            "phone_number": f"+91{rng.randrange(6000000000, 9999999999)}",
+        }
+    return {
+        "actionGroup": f"{name}_group",
+        "function": name,
+        "messageVersion": "1.0",
+        "parameters": [{"name": key, "value": value} for key, value in params.items()],
+    }
+
+
+def classify(result: Dict[str, Any]) -> str:
+    if "statusCode" in result:
+        return "error" if int(result["statusCode"]) >= 500 else "bad_request"
+    if result["response"]["functionResponse"].get("responseState") == "REPROMPT":
+        return "shed"
+    return "ok"
+
+
+class ErrorCapture(logging.Handler):
+    """Remembers the last error each container thread's handler logged, so
+    'error' outcomes can be told apart (saturation, bad credentials, schema, ...)."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.ERROR)
+        self.local = threading.local()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.local.message = record.getMessage()
+
+    def pop(self) -> Optional[str]:
+        message = getattr(self.local, "message", None)
+        self.local.message = None
+        return message
+
+
+error_capture = ErrorCapture()
+
+
+class Recorder:
+    """Collects per-invocation outcomes and per-second server and admission samples."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.container_starts: List[float] = []
+        self.invocations: List[Tuple[float, str, str, float, int]] = []
+        self.samples: Dict[int, Tuple[float, int, int, Dict[str, int]]] = {}
+        self.crashed: set = set()
+        self.errored: set = set()
+        self.error_causes: Counter = Counter()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def active_at(self, at: float) -> int:
+        with self.lock:
+            return bisect.bisect_right(self.container_starts, at)
+
+    def container_started(self) -> None:
+        with self.lock:
+            self.container_starts.append(self.elapsed())
+
+    def record(self, handler: str, outcome: str, latency: float) -> None:
+        with self.lock:
+            self.invocations.append((self.elapsed(), handler, outcome, latency, len(self.container_starts)))
+
+    def first_crash(self, handler: str) -> bool:
+        with self.lock:
+            if handler in self.crashed:
+                return False
+            self.crashed.add(handler)
+            return True
+
+    def record_error(self, handler: str, cause: str) -> bool:
+        """Count an error cause; True the first time this handler reports it."""
+        with self.lock:
+            self.error_causes[(handler, cause)] += 1
+            if handler in self.errored:
+                return False
+            self.errored.add(handler)
+            return True
+
+    def sample(self, second: int, threads_connected: int, admission: Dict[str, int]) -> None:
+        """Store the sample taken at the end of the given one-second interval."""
+        with self.lock:
+            self.samples[second] = (self.elapsed(), len(self.container_starts), threads_connected, admission)
+
+
+def container(index: int, args: argparse.Namespace, handlers: Dict[str, ModuleType],
+              weights: List[int], recorder: Recorder, stop: threading.Event) -> None:
+    """One virtual Lambda container: handles one invocation at a time, like the real runtime."""
+    rng = random.Random(args.seed + index)
+    names = list(handlers)
+    if stop.wait(args.ramp_seconds * index / args.containers):
+        return
+    recorder.container_started()
+
+    while not stop.is_set():
+        name = rng.choices(names, weights=weights)[0]
+        event = make_event(name, rng, args.customers, args.shoes)
+        started = time.monotonic()
+        error_capture.pop()
+        try:
+            outcome = classify(handlers[name].lambda_handler(event, None))
+        except Exception:
+            outcome = "crash"
+            if recorder.first_crash(name):
+                logger.exception("%s raised instead of returning a response", name)
+        if outcome == "error":
+            cause = error_capture.pop() or "no error logged"
+            if recorder.record_error(name, cause):
+                logger.warning("%s returned an error: %s", name, cause)
+        recorder.record(name, outcome, time.monotonic() - started)
+        if args.think_ms:
+            stop.wait(rng.uniform(0, 2 * args.think_ms) / 1000)
+
+
+def monitor(connection: Any, admission: ModuleType, recorder: Recorder, stop: threading.Event) -> None:
+    """Sample Threads_connected and admission counters at the end of each second.
+
+    Samples are scheduled against the recorder's start time so query time does
+    not make them drift; if one runs late, the next slot is used and the report
+    divides counter deltas by the real time between samples.
+    """
+    second = 1
+    while not stop.wait(max(0.0, recorder.started + second - time.monotonic())):
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW GLOBAL STATUS LIKE 'Threads_connected'")
+            connected = int(cursor.fetchone()[1]) - MONITOR_CONNECTIONS
+        recorder.sample(second - 1, connected, admission.stats.snapshot())
+        second = max(second + 1, int(recorder.elapsed()) + 1)
+
+
+def set_max_connections(value: int) -> int:
+    """Set the server connection cap as the admin account and return the previous value."""
+    import pymysql
+
+    connection = pymysql.connect(**admin_config())
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT @@GLOBAL.max_connections")
+            previous = int(cursor.fetchone()[0])
+            cursor.execute("SET GLOBAL max_connections = %s", (value,))
+        return previous
+    finally:
+        connection.close()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(recorder: Recorder, admission: ModuleType, args: argparse.Namespace) -> None:
+    by_second: Dict[int, Counter] = defaultdict(Counter)
+    latencies: Dict[int, List[float]] = defaultdict(list)
+    for at, _, outcome, latency, _ in recorder.invocations:
+        by_second[int(at)][outcome] += 1
+        latencies[int(at)].append(latency)
+
+    print(f"\nAdmission mode: {args.admission}  containers: {args.containers}  "
+          f"max_connections: {args.max_connections or 'unchanged'}")
+    print(f"{'t(s)':>5} {'active':>6} {'db_conn':>7} {'refused/s':>9} {'retried/s':>9} {'ok':>6} "
+          f"{'shed':>6} {'error':>6} {'other':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    previous_at, previous = 0.0, {"refused": 0, "retried": 0}
+    for second in range(int(recorder.elapsed()) + 1):
+        counts = by_second.get(second, Counter())
+        sample = recorder.samples.get(second)
+        if sample:
+            at, active, connected, stats = sample
+            # Rates over the real time since the previous sample, which may
+            # span more than one second if a sample ran late
+            interval = max(at - previous_at, 1e-6)
+            refused = f"{(stats['refused'] - previous['refused']) / interval:.0f}"
+            retried = f"{(stats['retried'] - previous['retried']) / interval:.0f}"
+            previous_at, previous = at, stats
+        else:
+            active = connected = refused = retried = "-"
+        other = sum(counts.values()) - counts["ok"] - counts["shed"] - counts["error"]
+        print(f"{second:>5} {active:>6} {connected:>7} {refused:>9} {retried:>9} {counts['ok']:>6} "
+              f"{counts['shed']:>6} {counts['error']:>6} {other:>6} "
+              f"{percentile(latencies[second], 50) * 1000:>8.0f} "
+              f"{percentile(latencies[second], 95) * 1000:>8.0f}")
+
+    totals = Counter(outcome for _, _, outcome, _, _ in recorder.invocations)
+    stats = admission.stats.snapshot()
+    print("\nTotals: " + ", ".join(f"{outcome}={count}" for outcome, count in sorted(totals.items())))
+    print(f"Connections refused={stats['refused']}, retried={stats['retried']}, shed={stats['shed']}")
+
+    first_refused_at = admission.stats.first_refused_at
+    if first_refused_at is not None:
+        at = first_refused_at - recorder.started
+        print(f"First refused connection at t={at:.1f}s with {recorder.active_at(at)} active containers")
+    else:
+        print("No refused connections")
+    for label, outcomes in (("error", ("error", "crash")), ("shed", ("shed",))):
+        first = next((inv for inv in recorder.invocations if inv[2] in outcomes), None)
+        if first:
+            print(f"First {label} at t={first[0]:.1f}s with {first[4]} active containers ({first[1]})")
+        else:
+            print(f"No {label} responses")
+
+    if recorder.error_causes:
+        print("Error causes:")
+        for (handler, cause), count in recorder.error_causes.most_common(10):
+            print(f"  {count:>7} {handler}: {cause}")
+
+    per_handler: Dict[str, Counter] = defaultdict(Counter)
+    for _, handler, outcome, _, _ in recorder.invocations:
+        per_handler[handler][outcome] += 1
+    for handler, counts in sorted(per_handler.items()):
+        print(f"  {handler}: " + ", ".join(f"{o}={c}" for o, c in sorted(counts.items())))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Simulate Lambda concurrency against a capped MySQL.")
+    parser.add_argument("--containers", type=int, default=100, help="peak concurrent virtual containers")
+    parser.add_argument("--ramp-seconds", type=float, default=20,
+                        help="time to ramp linearly from 1 to --containers")
+    parser.add_argument("--duration", type=float, default=40, help="total run time in seconds")
+    parser.add_argument("--max-connections", type=int, default=0,
+                        help="connection budget for the handlers (0 leaves the server cap unchanged)")
+    parser.add_argument("--admission", choices=("off", "queue", "shed"), default="queue",
+                        help="DB_ADMISSION_MODE for the handlers")
+    parser.add_argument("--admission-wait-ms", type=int, default=2000,
+                        help="DB_ADMISSION_WAIT_MS for the handlers in queue mode")
+    parser.add_argument("--mix", default="get_customer=6,create_order=3,new_user=1",
+                        help="relative weights of handler invocations")
+    parser.add_argument("--think-ms", type=float, default=0,
+                        help="mean pause between invocations per container")
+    parser.add_argument("--customers", type=int, default=100000, help="customer ids seeded")
+    parser.add_argument("--shoes", type=int, default=5000, help="shoe ids seeded")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    weights_by_name = {}
+    for part in args.mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in HANDLERS:
+            parser.error(f"unknown handler in --mix: {name}")
+        weights_by_name[name] = int(weight or 1)
+
+    # The handlers read their connection and admission settings from the
+    # environment at import time. Never reach the deployed database via DB_SECRET_ARN.
+    if not os.environ.get("DB_USER"):
+        parser.error("set DB_USER (and DB_PASSWORD) to the non-admin account the handlers should use")
+    os.environ.pop("DB_SECRET_ARN", None)
+    os.environ.setdefault("DB_HOST", "127.0.0.1")
+    os.environ.setdefault("DB_PORT", "3306")
+    os.environ.setdefault("DB_PASSWORD", "")
+    os.environ.setdefault("DB_NAME", "Shoeshop")
+    os.environ["DB_ADMISSION_MODE"] = args.admission
+    os.environ["DB_ADMISSION_WAIT_MS"] = str(args.admission_wait_ms)
+
+    logging.basicConfig(format="%(asctime)s %(message)s")
+    # Print only the simulator's own output and db_admission settings warnings;
+    # the handlers' per-request logs go nowhere and their errors to error_capture
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(lambda record: record.name in ("saturation_sim", "db_admission"))
+    logging.getLogger().addHandler(error_capture)
+    logger.setLevel(logging.INFO)
+    if os.environ["DB_USER"] == admin_config()["user"]:
+        logger.warning("DB_USER is the admin account; MySQL admits one extra connection past the cap")
+
+    sys.path.insert(0, os.path.join(LAMBDA_SRC, "common"))
+    admission = importlib.import_module("db_admission")
+    handlers = {name: load_handler(name) for name in weights_by_name}
+
+    # The handlers set the root logger to INFO at import; only their errors matter here
+    logging.getLogger().setLevel(logging.ERROR)
+
+    import pymysql
+
+    recorder = Recorder()
+    stop = threading.Event()
+    threads: List[threading.Thread] = []
+    previous_max = None
+    monitor_connection = None
+    try:
+        if args.max_connections:
+            previous_max = set_max_connections(args.max_connections + MONITOR_CONNECTIONS)
+        monitor_connection = pymysql.connect(**admin_config())
+        threads.append(threading.Thread(target=monitor,
+                                        args=(monitor_connection, admission, recorder, stop),
+                                        daemon=True))
+        threads += [
+            threading.Thread(target=container,
+                             args=(i, args, handlers, list(weights_by_name.values()), recorder, stop),
+                             daemon=True)
+            for i in range(args.containers)
+        ]
+
+        logger.info("Starting %d containers over %.0fs (admission=%s)",
+                    args.containers, args.ramp_seconds, args.admission)
+        for thread in threads:
+            thread.start()
+        stop.wait(args.duration)
+    except KeyboardInterrupt:
+        logger.info("Interrupted, stopping containers")
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=30)
+        if monitor_connection is not None:
+            monitor_connection.close()
+        if previous_max is not None:
+            set_max_connections(previous_max)
+
+    report(recorder, admission, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+"""Synthetic data generator for the Shoeshop database.
+
+Streams realistic rows for `shoes`, `customers`, `customer_contact` and
+`orders` into a local MySQL database using batched multi-row inserts, so
+the Lambda handlers in `lambda_src/` can be exercised at production scale.
+
+Usage:
+    python scripts/seed_data.py --create-schema --truncate \
+        --shoes 5000 --customers 1000000 --orders 10000000
+
+    # Measure generator throughput only, no database needed
+    python scripts/seed_data.py --dry-run --orders 1000000
+
+Connection settings are read from DB_HOST, DB_PORT, DB_USER, DB_PASSWORD
+and DB_NAME. Shoes and customers are loaded with explicit ids starting at 1,
+so the tables must be empty unless --truncate is given.
+"""
+import argparse
+import logging
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("seed_data")
+
+# Value distributions: (value, relative weight)
+ACTIVITY_TYPES = [
+    ("running", 30), ("walking", 22), ("casual", 20), ("gym", 10),
+    ("hiking", 7), ("basketball", 5), ("tennis", 3), ("formal", 3),
+]
+COLORS = [
+    ("black", 30), ("white", 22), ("grey", 12), ("blue", 10), ("red", 6),
+    ("brown", 6), ("navy", 5), ("green", 4), ("pink", 3), ("beige", 2),
+]
+# US sizes, roughly bell-shaped around 9-10
+SIZES = [
+    (5, 1), (6, 3), (7, 6), (8, 11), (9, 16), (10, 17), (11, 14),
+    (12, 9), (13, 4), (14, 1),
+]
+# shoe_type -> (median price, styles)
+SHOE_TYPES = {
+    "sneakers": (3500, ["low-top", "high-top", "slip-on", "retro"]),
+    "running shoes": (5500, ["neutral", "stability", "trail", "racing"]),
+    "boots": (6500, ["chelsea", "combat", "hiking", "ankle"]),
+    "sandals": (1500, ["slide", "flip-flop", "strappy", "sport"]),
+    "loafers": (4500, ["penny", "tassel", "driving"]),
+    "formal shoes": (7000, ["oxford", "derby", "brogue", "monk strap"]),
+    "training shoes": (4800, ["cross-training", "court", "lifting"]),
+}
+SHOE_TYPE_FOR_ACTIVITY = {
+    "running": ["running shoes", "sneakers"],
+    "walking": ["sneakers", "loafers", "sandals"],
+    "casual": ["sneakers", "loafers", "sandals", "boots"],
+    "gym": ["training shoes", "sneakers"],
+    "hiking": ["boots", "running shoes"],
+    "basketball": ["sneakers", "training shoes"],
+    "tennis": ["training shoes", "sneakers"],
+    "formal": ["formal shoes", "loafers"],
+}
+# Most common names, most frequent first
+FIRST_NAMES = [
+    "Aarav", "Priya", "Rahul", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya",
+    "Rohan", "Isha", "James", "Emma", "Liam", "Olivia", "Noah", "Ava",
+    "Mohammed", "Fatima", "Wei", "Mei", "Carlos", "Sofia", "Kenji", "Yuki",
+    "Aditya", "Divya", "Karan", "Pooja", "Sanjay", "Meera", "Nikhil", "Lakshmi",
+    "Daniel", "Grace", "Lucas", "Mia", "Ethan", "Chloe", "Omar", "Aisha",
+]
+LAST_NAMES = [
+    "Sharma", "Patel", "Reddy", "Iyer", "Gupta", "Khan", "Singh", "Nair",
+    "Smith", "Johnson", "Brown", "Garcia", "Martinez", "Chen", "Wang", "Kim",
+    "Tanaka", "Silva", "Müller", "Rossi", "Rao", "Joshi", "Menon", "Das",
+    "Williams", "Jones", "Lopez", "Nguyen", "Ali", "Ahmed",
+]
+# Syllables for the long tail of rarer names, so name lookups have
+# production-like selectivity instead of a few hundred very common names
+GIVEN_ONSETS = ["A", "Ba", "Cha", "Da", "E", "Fa", "Ga", "Ha", "I", "Ja", "Ka", "La",
+                "Ma", "Na", "O", "Pa", "Ra", "Sa", "Ta", "U", "Va", "Ya", "Za", "Shi"]
+GIVEN_ENDINGS = ["an", "ara", "ay", "el", "ena", "esh", "ia", "in", "ira", "it",
+                 "ol", "on", "ra", "ri", "ta", "ya", "yn", "vi"]
+SURNAME_ROOTS = ["Agar", "Bhat", "Chand", "Desh", "Kulkar", "Mahaj", "Pand", "Rath",
+                 "Sax", "Trived", "Varm", "Ander", "Bald", "Carl", "Fletch", "Hart",
+                 "Lind", "Morr", "Oster", "Peters", "Rich", "Stan", "Thomp", "Whit",
+                 "Ban", "Chow", "Dut", "Gosw", "Kap", "Mukh", "Sriv", "Wad"]
+SURNAME_SUFFIXES = ["a", "an", "ani", "ar", "ey", "ford", "i", "man", "ni", "son",
+                    "ski", "ton", "wal", "well", "ia", "kar"]
+MIDDLE_INITIALS = "ABCDEGHJKLMNPRSTV"
+
+# Name popularity follows a gentle Zipf curve over the ranked pools
+NAME_SKEW = 0.6
+
+
+def _name_pool(common: List[str], rare: Iterable[str]) -> Tuple[List[str], List[float]]:
+    names = list(dict.fromkeys([*common, *rare]))
+    return names, list(accumulate(1.0 / (rank ** NAME_SKEW) for rank in range(1, len(names) + 1)))
+
+
+GIVEN_NAMES, GIVEN_NAMES_CW = _name_pool(
+    FIRST_NAMES, (onset + ending for onset in GIVEN_ONSETS for ending in GIVEN_ENDINGS))
+SURNAMES, SURNAMES_CW = _name_pool(
+    LAST_NAMES, (root + suffix for root in SURNAME_ROOTS for suffix in SURNAME_SUFFIXES))
+
+
+def random_name(rng: random.Random) -> str:
+    """A customer name drawn from the same distribution the seeded customers use."""
+    given = rng.choices(GIVEN_NAMES, cum_weights=GIVEN_NAMES_CW)[0]
+    surname = rng.choices(SURNAMES, cum_weights=SURNAMES_CW)[0]
+    # About half the customers give a middle initial, which disambiguates common names
+    if rng.random() < 0.5:
+        return f"{given} {rng.choice(MIDDLE_INITIALS)}. {surname}"
+    return f"{given} {surname}"
+
+
+EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "hotmail.com", "icloud.com"]
+
+HISTORY_DAYS = 3 * 365
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS shoes (
+        shoe_id INT PRIMARY KEY,
+        shoe_type VARCHAR(50),
+        shoe_style VARCHAR(50),
+        color VARCHAR(30),
+        size INT,
+        price DECIMAL(10, 2),
+        suitable_for VARCHAR(50)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS customers (
+        customer_id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100),
+        activity_type VARCHAR(50),
+        shoe_size INT,
+        shoe_color_preference VARCHAR(30),
+        last_purchase_date DATETIME
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS customer_contact (
+        contact_id INT AUTO_INCREMENT PRIMARY KEY,
+        customer_id INT,
+        email VARCHAR(255),
+        phone_number VARCHAR(20)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS orders (
+        order_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        customer_id INT,
+        shoe_id INT,
+        order_date DATETIME
+    )
+    """,
+]
+
+# Secondary indexes matching the handlers' lookups. Built after the bulk
+# load, which is much faster than maintaining them row by row.
+# get_customer and new_user look customers up by LOWER(name), which only a
+# functional index can serve (MySQL 8.0.13+); create_order uses name = %s.
+INDEXES = [
+    ("customers", "idx_customers_name", "name"),
+    ("customers", "idx_customers_name_lower", "(LOWER(name))"),
+    ("customer_contact", "idx_contact_customer", "customer_id"),
+    ("orders", "idx_orders_customer_date", "customer_id, order_date"),
+    ("shoes", "idx_shoes_match", "suitable_for, size, color"),
+]
+
+INSERT_SQL = {
+    "shoes": "INSERT INTO shoes (shoe_id, shoe_type, shoe_style, color, size, price, suitable_for) "
+             "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+    "customers": "INSERT INTO customers (customer_id, name, activity_type, shoe_size, "
+                 "shoe_color_preference, last_purchase_date) VALUES (%s, %s, %s, %s, %s, %s)",
+    "customer_contact": "INSERT INTO customer_contact (customer_id, email, phone_number) "
+                        "VALUES (%s, %s, %s)",
+    "orders": "INSERT INTO orders (customer_id, shoe_id, order_date) VALUES (%s, %s, %s)",
+}
+
+
+def _split(pairs: Sequence[Tuple[Any, int]]) -> Tuple[List[Any], List[int]]:
+    """Turn [(value, weight), ...] into (values, cumulative weights) for random.choices."""
+    values = [value for value, _ in pairs]
+    return values, list(accumulate(weight for _, weight in pairs))
+
+
+def zipf_cum_weights(n: int, skew: float) -> List[float]:
+    """Cumulative Zipf weights so rank 1 is the most frequent of n items."""
+    return list(accumulate(1.0 / (rank ** skew) for rank in range(1, n + 1)))
+
+
+def shuffled_ids(n: int, rng: random.Random) -> List[int]:
+    """Ids 1..n in random order, so popularity rank is spread across the key range."""
+    ids = list(range(1, n + 1))
+    rng.shuffle(ids)
+    return ids
+
+
+def generate_shoes(n: int, rng: random.Random) -> Iterator[Tuple]:
+    activities, activity_cw = _split(ACTIVITY_TYPES)
+    colors, color_cw = _split(COLORS)
+    sizes, size_cw = _split(SIZES)
+
+    for shoe_id in range(1, n + 1):
+        activity = rng.choices(activities, cum_weights=activity_cw)[0]
+        shoe_type = rng.choice(SHOE_TYPE_FOR_ACTIVITY[activity])
+        median_price, styles = SHOE_TYPES[shoe_type]
+        # Log-normal prices give a long tail of premium models
+        price = round(median_price * rng.lognormvariate(0, 0.35), -1) - 1
+        yield (
+            shoe_id,
+            shoe_type,
+            rng.choice(styles),
+            rng.choices(colors, cum_weights=color_cw)[0],
+            rng.choices(sizes, cum_weights=size_cw)[0],
+            max(price, 299),
+            activity,
+        )
+
+
+def generate_customers(n: int, rng: random.Random, now: datetime) -> Iterator[Tuple]:
+    activities, activity_cw = _split(ACTIVITY_TYPES)
+    colors, color_cw = _split(COLORS)
+    sizes, size_cw = _split(SIZES)
+
+    for customer_id in range(1, n + 1):
+        # Registered users without preferences yet, as created by new_user
+        if rng.random() < 0.1:
+            activity = size = color = None
+        else:
+            activity = rng.choices(activities, cum_weights=activity_cw)[0]
+            size = rng.choices(sizes, cum_weights=size_cw)[0]
+            color = rng.choices(colors, cum_weights=color_cw)[0]
+        yield (
+            customer_id,
+            random_name(rng),
+            activity,
+            size,
+            color,
+            now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400)),
+        )
+
+
+def generate_contacts(n_customers: int, rng: random.Random) -> Iterator[Tuple]:
+    for customer_id in range(1, n_customers + 1):
+        # Not every customer went through new_user registration
+        if rng.random() < 0.3:
+            continue
+        first = rng.choice(GIVEN_NAMES).lower()
+        last = rng.choice(SURNAMES).lower()
+        yield (
+            customer_id,
+            f"{first}.{last}{customer_id}@{rng.choice(EMAIL_DOMAINS)}",
+            f"+91{rng.randrange(6000000000, 9999999999)}",
+        )
+
+
+def generate_orders(n: int, n_customers: int, n_shoes: int, rng: random.Random,
+                    now: datetime, skew: float, chunk: int = 10000) -> Iterator[Tuple]:
+    """Orders with Zipf-skewed customer and shoe popularity, biased towards recent dates."""
+    customer_ids = shuffled_ids(n_customers, rng)
+    shoe_ids = shuffled_ids(n_shoes, rng)
+    customer_cw = zipf_cum_weights(n_customers, skew)
+    shoe_cw = zipf_cum_weights(n_shoes, skew)
+    window = HISTORY_DAYS * 86400
+
+    remaining = n
+    while remaining > 0:
+        k = min(chunk, remaining)
+        customers = rng.choices(customer_ids, cum_weights=customer_cw, k=k)
+        shoes = rng.choices(shoe_ids, cum_weights=shoe_cw, k=k)
+        for customer_id, shoe_id in zip(customers, shoes):
+            # Squaring a uniform sample skews order dates towards today
+            seconds_ago = int(window * rng.random() ** 2)
+            yield customer_id, shoe_id, now - timedelta(seconds=seconds_ago)
+        remaining -= k
+
+
+def batched(rows: Iterable[Tuple], size: int) -> Iterator[List[Tuple]]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def load(connection: Optional[Any], table: str, rows: Iterable[Tuple], batch_size: int) -> int:
+    """Insert rows in batches and log throughput. With no connection, only generate."""
+    total = 0
+    started = time.perf_counter()
+    last_report = started
+
+    for batch in batched(rows, batch_size):
+        if connection is not None:
+            with connection.cursor() as cursor:
+                # pymysql rewrites executemany on INSERT ... VALUES into a
+                # single multi-row statement (split at max_allowed_packet)
+                cursor.executemany(INSERT_SQL[table], batch)
+            connection.commit()
+        total += len(batch)
+
+        now = time.perf_counter()
+        if now - last_report >= 5:
+            logger.info("%s: %s rows (%s rows/sec)", table, f"{total:,}",
+                        f"{total / (now - started):,.0f}")
+            last_report = now
+
+    elapsed = time.perf_counter() - started
+    logger.info("%s: loaded %s rows in %.1fs (%s rows/sec)", table, f"{total:,}", elapsed,
+                f"{total / elapsed:,.0f}" if elapsed else "n/a")
+    return total
+
+
+def connect() -> Any:
+    import pymysql
+
+    return pymysql.connect(
+        host=os.environ.get("DB_HOST", "127.0.0.1"),
+        port=int(os.environ.get("DB_PORT", "3306")),
+        user=os.environ.get("DB_USER", "root"),
+        password=os.environ.get("DB_PASSWORD", ""),
+        database=os.environ.get("DB_NAME", "Shoeshop"),
+        autocommit=False,
+    )
+
+
+class TablesNotEmpty(Exception):
+    """Raised when loading into tables that already hold rows without --truncate."""
+
+
+class SchemaMissing(Exception):
+    """Raised when a table does not exist and --create-schema was not given."""
+
+
+def prepare(connection: Any, create_schema: bool, truncate: bool) -> None:
+    import pymysql
+
+    with connection.cursor() as cursor:
+        # Session-only relaxations for the bulk load
+        cursor.execute("SET SESSION unique_checks = 0")
+        cursor.execute("SET SESSION foreign_key_checks = 0")
+        if create_schema:
+            for ddl in SCHEMA:
+                cursor.execute(ddl)
+        try:
+            if truncate:
+                for table in ("orders", "customer_contact", "customers", "shoes"):
+                    cursor.execute(f"TRUNCATE TABLE {table}")
+            else:
+                # Generated rows use explicit ids from 1 and reference them from
+                # customer_contact and orders, so existing rows would collide
+                non_empty = []
+                for table in ("shoes", "customers", "customer_contact", "orders"):
+                    cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {table})")
+                    if cursor.fetchone()[0]:
+                        non_empty.append(table)
+                if non_empty:
+                    raise TablesNotEmpty(
+                        f"Tables already contain rows: {', '.join(non_empty)}. "
+                        "Re-run with --truncate to replace them."
+                    )
+        except pymysql.ProgrammingError as e:
+            # 1146: table doesn't exist
+            if e.args and e.args[0] == 1146:
+                raise SchemaMissing(f"{e.args[1]}. Re-run with --create-schema to create the tables.") from e
+            raise
+    connection.commit()
+
+
+def create_indexes(connection: Any) -> None:
+    with connection.cursor() as cursor:
+        for table, name, columns in INDEXES:
+            cursor.execute(
+                "SELECT COUNT(*) FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+                (table, name),
+            )
+            if cursor.fetchone()[0]:
+                continue
+            started = time.perf_counter()
+            cursor.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+            logger.info("Created index %s on %s in %.1fs", name, table,
+                        time.perf_counter() - started)
+    connection.commit()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Seed the Shoeshop database with synthetic data.")
+    parser.add_argument("--shoes", type=int, default=5000)
+    parser.add_argument("--customers", type=int, default=100000)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--batch-size", type=int, default=5000,
+                        help="rows per multi-row INSERT / commit")
+    parser.add_argument("--skew", type=float, default=0.8,
+                        help="Zipf exponent for customer and shoe popularity in orders")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--create-schema", action="store_true",
+                        help="create the tables if they do not exist")
+    parser.add_argument("--truncate", action="store_true",
+                        help="empty the tables before loading")
+    parser.add_argument("--no-indexes", action="store_true",
+                        help="skip building secondary indexes after the load")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="generate rows without a database to measure generator throughput")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.orders and (args.customers < 1 or args.shoes < 1):
+        parser.error("--orders requires at least one customer and one shoe")
+
+    rng = random.Random(args.seed)
+    now = datetime.now().replace(microsecond=0)
+    connection = None if args.dry_run else connect()
+
+    try:
+        if connection is not None:
+            try:
+                prepare(connection, args.create_schema, args.truncate)
+            except (TablesNotEmpty, SchemaMissing) as e:
+                parser.error(str(e))
+
+        started = time.perf_counter()
+        total = 0
+        total += load(connection, "shoes", generate_shoes(args.shoes, rng), args.batch_size)
+        total += load(connection, "customers",
+                      generate_customers(args.customers, rng, now), args.batch_size)
+        total += load(connection, "customer_contact",
+                      generate_contacts(args.customers, rng), args.batch_size)
+        total += load(connection, "orders",
+                      generate_orders(args.orders, args.customers, args.shoes, rng, now, args.skew),
+                      args.batch_size)
+        elapsed = time.perf_counter() - started
+        logger.info("Total: %s rows in %.1fs (%s rows/sec)", f"{total:,}", elapsed,
+                    f"{total / elapsed:,.0f}" if elapsed else "n/a")
+
+        if connection is not None and not args.no_indexes:
+            create_indexes(connection)
+    finally:
+        if connection is not None:
+            connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import importlib
+import os
+import sys
+
+import pymysql
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lambda_src", "common"))
+
+import db_admission  # noqa: E402
+
+TOO_MANY_CONNECTIONS = pymysql.err.OperationalError(1040, "Too many connections")
+ACCESS_DENIED = pymysql.err.OperationalError(1045, "Access denied for user 'app'")
+
+
+@pytest.fixture
+def admission(monkeypatch):
+    for name in ("DB_SECRET_ARN", "DB_HOST", "DB_PORT", "DB_USER", "DB_PASSWORD", "DB_NAME"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("DB_HOST", "db.local")
+    monkeypatch.setenv("DB_USER", "app")
+    monkeypatch.setenv("DB_PASSWORD", "secret")
+    monkeypatch.setattr(db_admission, "_db_config", None)
+    monkeypatch.setattr(db_admission, "stats", db_admission.AdmissionStats())
+    monkeypatch.setattr(db_admission, "DB_ADMISSION_MODE", "queue")
+    monkeypatch.setattr(db_admission, "DB_ADMISSION_WAIT_MS", 2000)
+    monkeypatch.setattr(db_admission.time, "sleep", lambda seconds: None)
+    return db_admission
+
+
+def fake_connect(monkeypatch, outcomes):
+    """Patch pymysql.connect to raise or return the given outcomes in order."""
+    calls = []
+
+    def connect(**kwargs):
+        calls.append(kwargs)
+        outcome = outcomes[min(len(calls), len(outcomes)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(db_admission.pymysql, "connect", connect)
+    return calls
+
+
+def test_queue_retries_connection_limit_then_succeeds(admission, monkeypatch):
+    connection = object()
+    calls = fake_connect(monkeypatch, [TOO_MANY_CONNECTIONS, TOO_MANY_CONNECTIONS, connection])
+
+    assert admission.connect_with_admission(cursorclass="dict") is connection
+    assert len(calls) == 3
+    assert calls[-1]["host"] == "db.local"
+    assert calls[-1]["cursorclass"] == "dict"
+    assert admission.stats.snapshot() == {"refused": 2, "retried": 2, "shed": 0}
+    assert admission.stats.first_refused_at is not None
+
+
+def test_queue_sheds_after_wait(admission, monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(admission.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(admission.time, "sleep", lambda seconds: clock.__setitem__(0, clock[0] + seconds))
+    monkeypatch.setattr(admission, "DB_ADMISSION_WAIT_MS", 3000)
+    calls = fake_connect(monkeypatch, [TOO_MANY_CONNECTIONS])
+
+    with pytest.raises(admission.DatabaseBusy):
+        admission.connect_with_admission()
+    # Backoff sleeps never overshoot the deadline
+    assert clock[0] == pytest.approx(3.0)
+    assert len(calls) > 2
+    assert admission.stats.snapshot() == {"refused": len(calls), "retried": len(calls) - 1, "shed": 1}
+
+
+def test_shed_gives_up_on_first_refusal(admission, monkeypatch):
+    monkeypatch.setattr(admission, "DB_ADMISSION_MODE", "shed")
+    calls = fake_connect(monkeypatch, [TOO_MANY_CONNECTIONS, object()])
+
+    with pytest.raises(admission.DatabaseBusy):
+        admission.connect_with_admission()
+    assert len(calls) == 1
+    assert admission.stats.snapshot() == {"refused": 1, "retried": 0, "shed": 1}
+
+
+def test_off_reraises_original_error(admission, monkeypatch):
+    monkeypatch.setattr(admission, "DB_ADMISSION_MODE", "off")
+    calls = fake_connect(monkeypatch, [TOO_MANY_CONNECTIONS, object()])
+
+    with pytest.raises(pymysql.err.OperationalError) as excinfo:
+        admission.connect_with_admission()
+    assert excinfo.value is TOO_MANY_CONNECTIONS
+    assert len(calls) == 1
+    assert admission.stats.snapshot() == {"refused": 1, "retried": 0, "shed": 0}
+
+
+def test_other_errors_are_not_retried(admission, monkeypatch):
+    calls = fake_connect(monkeypatch, [ACCESS_DENIED, object()])
+
+    with pytest.raises(pymysql.err.OperationalError) as excinfo:
+        admission.connect_with_admission()
+    assert excinfo.value is ACCESS_DENIED
+    assert len(calls) == 1
+    assert admission.stats.snapshot() == {"refused": 0, "retried": 0, "shed": 0}
+    assert admission.stats.first_refused_at is None
+
+
+@pytest.mark.parametrize("mode, wait_ms", [("shedd", "abc"), ("queue ", "-5"), ("", "")])
+def test_invalid_settings_fall_back_to_defaults(monkeypatch, caplog, mode, wait_ms):
+    monkeypatch.setenv("DB_ADMISSION_MODE", mode)
+    monkeypatch.setenv("DB_ADMISSION_WAIT_MS", wait_ms)
+    try:
+        module = importlib.reload(db_admission)
+        assert module.DB_ADMISSION_MODE == "queue"
+        assert module.DB_ADMISSION_WAIT_MS == 2000
+    finally:
+        monkeypatch.delenv("DB_ADMISSION_MODE")
+        monkeypatch.delenv("DB_ADMISSION_WAIT_MS")
+        importlib.reload(db_admission)
+    if wait_ms:
+        assert "Invalid DB_ADMISSION_WAIT_MS" in caplog.text
+
+
+def test_valid_settings_are_used(monkeypatch):
+    monkeypatch.setenv("DB_ADMISSION_MODE", "SHED")
+    monkeypatch.setenv("DB_ADMISSION_WAIT_MS", "500")
+    try:
+        module = importlib.reload(db_admission)
+        assert module.DB_ADMISSION_MODE == "shed"
+        assert module.DB_ADMISSION_WAIT_MS == 500
+    finally:
+        monkeypatch.delenv("DB_ADMISSION_MODE")
+        monkeypatch.delenv("DB_ADMISSION_WAIT_MS")
+        importlib.reload(db_admission)
+
+
+def test_config_from_secret_with_env_overrides(admission, monkeypatch):
+    monkeypatch.delenv("DB_USER")
+    monkeypatch.delenv("DB_PASSWORD")
+    monkeypatch.setenv("DB_SECRET_ARN", "arn:secret")
+    monkeypatch.setattr(admission, "_load_secret", lambda arn: {
+        "host": "rds.internal", "port": 3306, "user": "admin", "password": "from-secret",
+        "database": "Shoeshop",
+    })
+
+    config = admission.db_config()
+    assert config["host"] == "db.local"
+    assert config["user"] == "admin"
+    assert config["password"] == "from-secret"
+
+
+def test_missing_credentials_raise(admission, monkeypatch):
+    monkeypatch.delenv("DB_PASSWORD")
+
+    with pytest.raises(RuntimeError, match="password"):
+        admission.db_config()